@@ -36,7 +36,7 @@
 #     print("\n[2/3] Running visual + audio analysis in parallel...")
 #     parallel_start = time.time()
     
-#     with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+#     with ThreadPoolExecutor(max_workers=2) as executor:
 #         # Submit both tasks simultaneously
 #         visual_future = executor.submit(analyse_images, video_clip)
 #         audio_future = executor.submit(transcribe_audio_s3, audio_clip)
@@ -61,9 +61,7 @@
 #     save_report(report_str)
 
 
-# import os
-# import dotenv
-# dotenv.load_dotenv()
+# from vidcrawl import clear_bucket
 
-# os.system("aws s3 rm s3://aws-hack-bucket --recursive")
+# clear_bucket("aws-hack-bucket")
 
@@ -1,16 +1,29 @@
 import streamlit as st
 import os
+import json
+import hashlib
 import time
-from typing import List, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor
-import boto3
-from dotenv import load_dotenv
+import tempfile
+from pathlib import Path
+import asyncio
+from typing import List, Dict, Optional, Tuple, Iterator
 
-from vidcrawl import separator, analyse_images, transcribe_audio_s3
-from vidcrawl._merger import create_unified_report
+from vidcrawl import (
+    get_duration,
+    extract_audio,
+    extract_video,
+    analyse_images,
+    transcribe_audio_s3,
+)
+from vidcrawl._merger import create_unified_report, merge_timeline
 from vidcrawl.core.datamodel import Transcript, AudioClip, VideoClip
+from vidcrawl.core._aws import get_client
 
-load_dotenv()
+REPORT_CACHE_DIR = Path(".reportcache")
+REPORT_CACHE_TTL = 7 * 24 * 3600  # Seconds before a stored report is redone
+REPORT_CACHE_MAX_ENTRIES = 64  # Oldest reports are pruned beyond this
+MAX_HISTORY_MESSAGES = 12  # Last 6 user/assistant turns sent to Bedrock
+RECENT_MESSAGES = 20  # Messages always rendered; older ones behind a toggle
 
 # ============================================================================
 # PAGE CONFIG
@@ -27,178 +40,136 @@ st.set_page_config(
 # CUSTOM CSS
 # ============================================================================
 
-st.markdown("""
-<style>
-    /* Main container */
-    .main {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    [data-testid="stSidebar"] * {
-        color: white !important;
-    }
-    
-    /* Chat messages */
-    .user-message {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 15px 20px;
-        border-radius: 18px 18px 5px 18px;
-        margin: 10px 0;
-        margin-left: 20%;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    
-    .assistant-message {
-        background: white;
-        color: #333;
-        padding: 15px 20px;
-        border-radius: 18px 18px 18px 5px;
-        margin: 10px 0;
-        margin-right: 20%;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        border: 1px solid #e0e0e0;
-    }
-    
-    .message-sender {
-        font-weight: bold;
-        margin-bottom: 5px;
-        font-size: 12px;
-        opacity: 0.8;
-    }
-    
-    /* Status badges */
-    .status-badge {
-        padding: 8px 16px;
-        border-radius: 20px;
-        font-weight: bold;
-        display: inline-block;
-        margin: 10px 0;
-    }
-    
-    .status-success {
-        background: #4CAF50;
-        color: white;
-    }
-    
-    .status-processing {
-        background: #FF9800;
-        color: white;
-    }
-    
-    .status-waiting {
-        background: #2196F3;
-        color: white;
-    }
-    
-    /* Buttons */
-    .stButton>button {
-        width: 100%;
-        border-radius: 10px;
-        padding: 12px;
-        font-weight: bold;
-        transition: all 0.3s;
-    }
-    
-    /* Headers */
-    h1 {
-        color: #667eea;
-        text-align: center;
-        padding: 20px 0;
-    }
-    
-    /* Info boxes */
-    .info-box {
-        background: white;
-        padding: 20px;
-        border-radius: 15px;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        margin: 15px 0;
-    }
-    
-    /* Upload section */
-    [data-testid="stFileUploader"] {
-        background: rgba(255,255,255,0.2);
-        padding: 20px;
-        border-radius: 10px;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_data
+def load_css() -> str:
+    """Read the stylesheet once per server process."""
+    return (Path(__file__).parent / "assets" / "style.css").read_text(encoding="utf-8")
+
+
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_bedrock_client():
-    """Create Bedrock client for chat"""
-    return boto3.client(
-        "bedrock-runtime",
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-        region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+class DegradedAnalysis(Exception):
+    """Carries a partial pipeline result out of run_analysis.
+
+    st.cache_data doesn't store calls that raise, so raising keeps results
+    with a failed step out of the cache while still handing them back.
+    """
+
+    def __init__(self, result: Tuple[str, List[Transcript], AudioClip, VideoClip]):
+        super().__init__("analysis completed with a failed step")
+        self.result = result
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def run_analysis(
+    video_hash: str,
+    _video_path: str,
+    num_frames: int,
+    sample_rate: int,
+) -> Tuple[str, List[Transcript], AudioClip, VideoClip]:
+    """Cached wrapper around analyze_video_parallel, keyed on the video hash.
+
+    Raises DegradedAnalysis (and so isn't cached) when transcription failed.
+    """
+    *result, degraded = analyze_video_parallel(_video_path, num_frames, sample_rate)
+    if degraded:
+        raise DegradedAnalysis(tuple(result))
+    return tuple(result)
+
+
+async def analyze_video_parallel_async(
+    video_path: str,
+    num_frames: int = 30,
+    sample_rate: int = 20
+) -> Tuple[str, List[Transcript], AudioClip, VideoClip, bool]:
+    """Optimized pipeline: Run the audio and visual branches concurrently on one event loop.
+    
+    Transcription starts as soon as the audio is uploaded, overlapping with
+    keyframe extraction instead of waiting for it. A failed transcription
+    doesn't fail the analysis; it continues without audio and the last
+    element of the result (`degraded`) is set.
+    """
+    duration = await asyncio.to_thread(get_duration, video_path)
+    
+    async def visual_branch() -> Tuple[str, VideoClip]:
+        video_clip = await asyncio.to_thread(
+            extract_video, video_path, duration, num_frames, sample_rate
+        )
+        return await asyncio.to_thread(analyse_images, video_clip), video_clip
+    
+    async def audio_branch() -> Tuple[List[Transcript], AudioClip, bool]:
+        audio_clip = await asyncio.to_thread(extract_audio, video_path, duration)
+        try:
+            transcripts = await asyncio.to_thread(
+                transcribe_audio_s3, audio_clip, raise_errors=True
+            )
+        except Exception as e:
+            print(f"Continuing without transcripts: {e}")
+            return [], audio_clip, True
+        return transcripts, audio_clip, False
+    
+    (visual_analysis, video_clip), (transcripts, audio_clip, degraded) = (
+        await asyncio.gather(visual_branch(), audio_branch())
     )
+    
+    return visual_analysis, transcripts, audio_clip, video_clip, degraded
+
 
 def analyze_video_parallel(
     video_path: str,
     num_frames: int = 30,
     sample_rate: int = 20
-) -> Tuple[str, List[Transcript], AudioClip, VideoClip]:
-    """Optimized pipeline: Run transcription and visual analysis in parallel."""    
-    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-        audio_clip, video_clip = separator(video_path, num_frames, sample_rate)
-        
-        visual_future = executor.submit(analyse_images, video_clip)
-        audio_future = executor.submit(transcribe_audio_s3, audio_clip)
-        
-        visual_analysis = visual_future.result()
-        transcripts = audio_future.result()
-    
-    return visual_analysis, transcripts, audio_clip, video_clip
+) -> Tuple[str, List[Transcript], AudioClip, VideoClip, bool]:
+    """Synchronous entry point for Streamlit."""
+    return asyncio.run(
+        analyze_video_parallel_async(video_path, num_frames, sample_rate)
+    )
 
 
 def chat_with_video(
     user_message: str,
     video_report: str,
     chat_history: List[Dict],
+    history_summary: str = "",
     model_id: str = "us.amazon.nova-pro-v1:0"
-) -> str:
-    """Chat with the video analysis using Bedrock.
+) -> Iterator[str]:
+    """Chat with the video analysis using Bedrock, streaming the reply.
     
     Args:
         user_message: The user's message/query
         video_report: Pre-generated text analysis of the video
         chat_history: List of previous messages in the conversation
+        history_summary: Summary of turns older than the history window
         model_id: ID of the Bedrock model to use (default: "us.amazon.nova-pro-v1:0")
         
-    Returns:
-        The model's response as a string
+    Yields:
+        Chunks of the model's response text as they arrive
     """
     try:
-        bedrock = get_bedrock_client()
+        bedrock = get_client("bedrock-runtime")
         messages = []
         
-        # System context - only add for the first message
-        if not chat_history:
-            system_prompt = f"""You are a helpful AI assistant analyzing a video. Here is the complete video analysis report:
+        # Video report goes in the system prompt, marked as a cache point so
+        # Bedrock can reuse it across turns instead of re-reading it
+        system_prompt = f"""You are a helpful AI assistant analyzing a video. Here is the complete video analysis report:
 
-            {video_report}
+        {video_report}
 
-            Use this report to answer user questions about the video. Be specific, reference timestamps, and provide detailed insights.
-            If asked about something not in the report, say you don't have that information."""
-                
-            messages.extend([
-                {"role": "user", "content": [{"text": system_prompt}]},
-                {"role": "assistant", "content": [{"text": "I've analyzed the video report. I'm ready to answer your questions!"}]}
-            ])
+        Use this report to answer user questions about the video. Be specific, reference timestamps, and provide detailed insights.
+        If asked about something not in the report, say you don't have that information."""
+        system = [{"text": system_prompt}, {"cachePoint": {"type": "default"}}]
+        if history_summary:
+            # After the cache point so updating it keeps the report cached
+            system.append({"text": f"Summary of the earlier conversation:\n{history_summary}"})
         
-        # Add chat history
-        for msg in chat_history:
+        # Add recent chat history only, so per-turn payload stays bounded.
+        # History is stored as user/assistant pairs, so an even window always
+        # starts on a user turn as Bedrock requires.
+        for msg in chat_history[-MAX_HISTORY_MESSAGES:]:
             if isinstance(msg, dict) and "role" in msg and "content" in msg:
                 messages.append({
                     "role": msg["role"],
@@ -211,10 +182,11 @@ def chat_with_video(
             "content": [{"text": user_message}]
         })
         
-        # Get response from Bedrock
-        response = bedrock.converse(
+        # Stream response from Bedrock
+        response = bedrock.converse_stream(
             modelId=model_id,
             messages=messages,
+            system=system,
             inferenceConfig={
                 "maxTokens": 2048,
                 "temperature": 0.7,
@@ -223,13 +195,89 @@ def chat_with_video(
             }
         )
         
-        # Extract and return the response text
-        return response["output"]["message"]["content"][0]["text"]
+        # Yield text deltas as they arrive
+        for event in response["stream"]:
+            if "metadata" in event:
+                continue
+            text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                yield text
         
     except Exception as e:
         error_msg = f"Error in chat_with_video: {str(e)}"
         print(error_msg)  # Log the error for debugging
-        return "I'm sorry, I encountered an error processing your request. Please try again."
+        yield "I'm sorry, I encountered an error processing your request. Please try again."
+
+
+def summarize_history(
+    previous_summary: str,
+    chat_history: List[Dict],
+    model_id: str = "us.amazon.nova-lite-v1:0"
+) -> str:
+    """Fold chat turns that left the history window into a running summary.
+    
+    Args:
+        previous_summary: Summary produced for earlier turns (may be empty)
+        chat_history: Turns to add to the summary
+        model_id: ID of the Bedrock model to use (default: "us.amazon.nova-lite-v1:0")
+        
+    Returns:
+        Updated summary, or the previous one if the call fails
+    """
+    transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in chat_history)
+    prompt = f"""Update the summary of a conversation about a video with the new turns below.
+    Keep timestamps, facts and open questions; keep it under 200 words.
+
+    Current summary:
+    {previous_summary or "(none)"}
+
+    New turns:
+    {transcript}"""
+    
+    try:
+        response = get_client("bedrock-runtime").converse(
+            modelId=model_id,
+            messages=[{"role": "user", "content": [{"text": prompt}]}],
+            inferenceConfig={"maxTokens": 400, "temperature": 0.2}
+        )
+        return response["output"]["message"]["content"][0]["text"]
+    except Exception as e:
+        print(f"Error in summarize_history: {str(e)}")
+        return previous_summary
+
+
+def report_cache_path(
+    video_hash: str, num_frames: int, sample_rate: int, model_id: str
+) -> Path:
+    """Location of the cached report for a video and analysis settings."""
+    key = hashlib.blake2b(
+        f"{video_hash}:{num_frames}:{sample_rate}:{model_id}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return REPORT_CACHE_DIR / f"{key}.json"
+
+
+def load_cached_report(cache_path: Path) -> Optional[Dict]:
+    """Read a stored report, dropping it once it is older than the TTL."""
+    try:
+        if time.time() - cache_path.stat().st_mtime > REPORT_CACHE_TTL:
+            cache_path.unlink()
+            return None
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_report(cache_path: Path, entry: Dict):
+    """Store a report and prune the oldest ones beyond the size limit."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(entry), encoding="utf-8")
+    
+    entries = sorted(
+        cache_path.parent.glob("*.json"), key=lambda p: p.stat().st_mtime
+    )
+    for stale in entries[:-REPORT_CACHE_MAX_ENTRIES]:
+        stale.unlink(missing_ok=True)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -245,8 +293,16 @@ if "processing_time" not in st.session_state:
     st.session_state.processing_time = 0
 if "transcript_count" not in st.session_state:
     st.session_state.transcript_count = 0
-if "last_user_input" not in st.session_state:
-    st.session_state.last_user_input = ""
+if "history_summary" not in st.session_state:
+    st.session_state.history_summary = ""
+if "summarized_count" not in st.session_state:
+    st.session_state.summarized_count = 0
+if "video_file_id" not in st.session_state:
+    st.session_state.video_file_id = None
+if "video_hash" not in st.session_state:
+    st.session_state.video_hash = None
+if "video_temp_path" not in st.session_state:
+    st.session_state.video_temp_path = None
 
 
 # ============================================================================
@@ -268,10 +324,30 @@ with st.sidebar:
     if uploaded_file:
         st.success(f"✓ Uploaded: {uploaded_file.name}")
         
-        # Save uploaded file temporarily
-        temp_path = f"temp_{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        # Save uploaded file temporarily, streaming in 1 MiB chunks and
+        # hashing as we go (only when the upload changed or was cleaned up).
+        # The temp file is unique to this session, so another session
+        # uploading a file with the same name can't replace it.
+        temp_path = st.session_state.video_temp_path
+        if (
+            st.session_state.video_file_id != uploaded_file.file_id
+            or temp_path is None
+            or not os.path.exists(temp_path)
+        ):
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            fd, temp_path = tempfile.mkstemp(
+                prefix="temp_", suffix=Path(uploaded_file.name).suffix, dir="."
+            )
+            video_hash = hashlib.blake2b(digest_size=16)
+            uploaded_file.seek(0)
+            with os.fdopen(fd, "wb") as f:
+                while chunk := uploaded_file.read(1 << 20):
+                    video_hash.update(chunk)
+                    f.write(chunk)
+            st.session_state.video_file_id = uploaded_file.file_id
+            st.session_state.video_hash = video_hash.hexdigest()
+            st.session_state.video_temp_path = temp_path
     
 
     st.markdown("---")
@@ -304,42 +380,76 @@ with st.sidebar:
         if st.button("🚀 Analyze Video", type="primary", use_container_width=True):
             st.session_state.is_analyzed = False
             st.session_state.chat_history = []
+            st.session_state.history_summary = ""
+            st.session_state.summarized_count = 0
             
             with st.spinner("🔄 Analyzing video... This may take a few minutes."):
                 progress_bar = st.progress(0)
-                status_text = st.empty()
                 
                 try:
                     start_time = time.time()
                     
-                    # Step 1: Extract
-                    status_text.text("📹 Extracting frames and audio...")
-                    progress_bar.progress(20)
-                    
-                    visual_analysis, transcripts, audio_clip, video_clip = analyze_video_parallel(
-                        temp_path, num_frames, sample_rate
-                    )
-                    
-                    # Step 2: Generate report
-                    status_text.text("📝 Creating unified report...")
-                    progress_bar.progress(70)
-                    
                     model_id = "us.amazon.nova-lite-v1:0" if use_lite else "us.amazon.nova-pro-v1:0"
-                    report = create_unified_report(
-                        visual_analysis, transcripts, video_clip, audio_clip, model_id
+                    cache_path = report_cache_path(
+                        st.session_state.video_hash, num_frames, sample_rate, model_id
                     )
                     
+                    cached = load_cached_report(cache_path)
+                    if cached is not None:
+                        # Same video and settings: reuse the stored report
+                        report = cached["report"]
+                        transcript_count = cached["transcript_count"]
+                    else:
+                        # Step 1: Extract
+                        progress_bar.progress(20, text="📹 Extracting frames and audio...")
+                        
+                        try:
+                            result = run_analysis(
+                                st.session_state.video_hash, temp_path, num_frames, sample_rate
+                            )
+                            degraded = False
+                        except DegradedAnalysis as e:
+                            result = e.result
+                            degraded = True
+                        visual_analysis, transcripts, audio_clip, video_clip = result
+                        
+                        # Step 2: Generate report
+                        progress_bar.progress(70, text="📝 Creating unified report...")
+                        
+                        try:
+                            report = create_unified_report(
+                                visual_analysis,
+                                transcripts,
+                                video_clip,
+                                audio_clip,
+                                model_id,
+                                raise_errors=True,
+                            )
+                        except Exception as e:
+                            print(f"Falling back to merged timeline: {e}")
+                            report = merge_timeline(
+                                visual_analysis, transcripts, video_clip.end
+                            )
+                            degraded = True
+                        transcript_count = len(transcripts)
+                        
+                        # Only complete results are reused; a transient
+                        # Transcribe or Bedrock failure is retried next time
+                        if not degraded:
+                            save_cached_report(
+                                cache_path,
+                                {"report": report, "transcript_count": transcript_count},
+                            )
+                    
                     # Save to session state
                     st.session_state.video_report = report
-                    st.session_state.transcript_count = len(transcripts)
+                    st.session_state.transcript_count = transcript_count
                     st.session_state.processing_time = time.time() - start_time
                     st.session_state.is_analyzed = True
                     
-                    progress_bar.progress(100)
-                    status_text.text("✅ Complete!")
+                    progress_bar.progress(100, text="✅ Complete!")
                     
                     st.success(f"✅ Analysis complete in {st.session_state.processing_time:.1f}s!")
-                    st.balloons()
                     
                     # Cleanup
                     if os.path.exists(temp_path):
@@ -379,90 +489,69 @@ with st.sidebar:
 
 st.title("💬 Chat with Your Video")
 
-# Check if video is analyzed
-if not st.session_state.is_analyzed:
-    st.markdown("""
-    <div class="info-box" style="text-align: center; padding: 60px;">
-        <h2>👋 Welcome!</h2>
-        <p style="font-size: 18px; color: #666;">
-            Upload a video in the sidebar and click "Analyze Video" to start chatting about its content.
-        </p>
-        <br>
-        <p style="color: #999;">
-            ✨ Ask about timestamps, events, highlights, and more!
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
-else:
-    # Chat interface
-    st.markdown('<div class="info-box">', unsafe_allow_html=True)
-    
+
+def render_message(role: str, content: str):
+    """Render one chat message."""
+    with st.chat_message(role):
+        st.markdown(content)
+
+
+def clear_chat():
+    """Reset the conversation (runs as a callback before the fragment reruns)."""
+    st.session_state.chat_history = []
+    st.session_state.history_summary = ""
+    st.session_state.summarized_count = 0
+
+
+@st.fragment
+def render_chat():
+    """Chat area; reruns on its own so the sidebar and CSS are left untouched."""
     # Display chat history
-    chat_container = st.container()
-    with chat_container:
-        if not st.session_state.chat_history:
-            st.markdown("""
-            <div style="text-align: center; padding: 30px; color: #666;">
-                <h3>👋 Ready to chat!</h3>
-                <p>Ask me anything about the video:</p>
-                <ul style="list-style: none; padding: 0;">
-                    <li>🕐 "What happened at 2:35?"</li>
-                    <li>⚽ "Summarize the key moments"</li>
-                    <li>🎯 "Tell me about the goal"</li>
-                    <li>📊 "What was the overall atmosphere?"</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        else:
-            for msg in st.session_state.chat_history:
-                if msg["role"] == "user":
-                    st.markdown(f"""
-                    <div class="user-message">
-                        <div class="message-sender">You</div>
-                        {msg["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="assistant-message">
-                        <div class="message-sender">AI Assistant</div>
-                        {msg["content"]}
-                    </div>
-                    """, unsafe_allow_html=True)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Chat input
-    st.markdown("---")
-    
-    col1, col2 = st.columns([5, 1])
-    
-    with col1:
-        user_input = st.text_input(
-            "Message",
-            placeholder="Ask about the video...",
-            label_visibility="collapsed",
-            key="user_input_field"
-        )
-    
-    with col2:
-        send_button = st.button("Send 📤", use_container_width=True)
-    
-    # Handle message sending - FIXED: Only process if button clicked AND input is new
-    if send_button and user_input.strip() and user_input != st.session_state.last_user_input:
-        # Store the input to prevent reprocessing
-        st.session_state.last_user_input = user_input
+    intro = st.empty()
+    if not st.session_state.chat_history:
+        intro.markdown("""
+        <div style="text-align: center; padding: 30px; color: #666;">
+            <h3>👋 Ready to chat!</h3>
+            <p>Ask me anything about the video:</p>
+            <ul style="list-style: none; padding: 0;">
+                <li>🕐 "What happened at 2:35?"</li>
+                <li>⚽ "Summarize the key moments"</li>
+                <li>🎯 "Tell me about the goal"</li>
+                <li>📊 "What was the overall atmosphere?"</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Older messages are only rendered on request so each rerun draws a
+    # bounded window (st.expander would still build its collapsed children)
+    archived = st.session_state.chat_history[:-RECENT_MESSAGES]
+    recent = st.session_state.chat_history[-RECENT_MESSAGES:]
+    if archived and st.toggle(f"Show earlier messages ({len(archived)})", key="show_archived"):
+        for msg in archived:
+            render_message(msg["role"], msg["content"])
+    
+    for msg in recent:
+        render_message(msg["role"], msg["content"])
+    
+    # Handle message sending - chat_input only returns a value on submit
+    if user_input := st.chat_input("Ask about the video..."):
+        intro.empty()
+        with st.chat_message("user"):
+            st.markdown(user_input)
         
-        # Get AI response FIRST (don't add user message to history yet)
-        with st.spinner("🤔 AI is thinking..."):
-            ai_response = chat_with_video(
-                user_input,
-                st.session_state.video_report,
-                st.session_state.chat_history  # Pass current history WITHOUT the new message
+        # Stream AI response FIRST (don't add user message to history yet)
+        with st.chat_message("assistant"):
+            ai_response = st.write_stream(
+                chat_with_video(
+                    user_input,
+                    st.session_state.video_report,
+                    st.session_state.chat_history,  # Pass current history WITHOUT the new message
+                    st.session_state.history_summary,
+                )
             )
         
-        # NOW add both user message and AI response to history
+        # NOW add both user message and AI response to history; both are
+        # already on screen, so no rerun is needed
         st.session_state.chat_history.append({
             "role": "user",
             "content": user_input
@@ -473,15 +562,36 @@ else:
             "content": ai_response
         })
         
-        # Rerun to update chat
-        st.rerun()
+        # Summarize turns that just slid out of the window, once each
+        overflow = len(st.session_state.chat_history) - MAX_HISTORY_MESSAGES
+        if overflow > st.session_state.summarized_count:
+            st.session_state.history_summary = summarize_history(
+                st.session_state.history_summary,
+                st.session_state.chat_history[st.session_state.summarized_count:overflow],
+            )
+            st.session_state.summarized_count = overflow
     
     # Clear chat button
     if st.session_state.chat_history:
-        if st.button("🗑️ Clear Chat", type="secondary"):
-            st.session_state.chat_history = []
-            st.session_state.last_user_input = ""
-            st.rerun()
+        st.button("🗑️ Clear Chat", type="secondary", on_click=clear_chat)
+
+
+# Check if video is analyzed
+if not st.session_state.is_analyzed:
+    st.markdown("""
+    <div class="info-box" style="text-align: center; padding: 60px;">
+        <h2>👋 Welcome!</h2>
+        <p style="font-size: 18px; color: #666;">
+            Upload a video in the sidebar and click "Analyze Video" to start chatting about its content.
+        </p>
+        <br>
+        <p style="color: #999;">
+            ✨ Ask about timestamps, events, highlights, and more!
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+else:
+    render_chat()
 
 
 # ============================================================================
@@ -1 +1,6 @@
+from dotenv import load_dotenv
+
+# Load AWS credentials once, before any client is created
+load_dotenv()
+
 from .core import *
@@ -1,36 +1,25 @@
 from typing import List, Optional
-import boto3
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
 from .core.datamodel import AudioClip, VideoClip, Transcript
+from .core._aws import get_client
+from .core._llm import collect_stream_text
 
-load_dotenv()
 
+@lru_cache(maxsize=8192)
+def _format_whole_seconds(total: int) -> str:
+    """Format whole seconds as MM:SS or HH:MM:SS (memoized)."""
+    minutes, secs = divmod(total, 60)
+    hours, minutes = divmod(minutes, 60)
 
-def get_aws_client(service_name: str):
-    """Create AWS client with consistent credentials."""
-    try:
-        return boto3.client(
-            service_name,
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-            region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-        )
-    except Exception as e:
-        print(f"Failed to create {service_name} client: {e}")
-        raise
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
 
 
 def format_timestamp(seconds: float) -> str:
     """Format seconds as MM:SS or HH:MM:SS."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    return f"{minutes:02d}:{secs:02d}"
+    # Key the cache on whole seconds so e.g. 2.01 and 2.99 share an entry
+    return _format_whole_seconds(int(seconds))
 
 
 def merge_timeline(
@@ -68,15 +57,13 @@ def merge_timeline(
     if not transcripts:
         markdown.append("*No transcription available*\n")
     else:
-        for i, t in enumerate(transcripts, 1):
-            time_range = f"{format_timestamp(t.start)} - {format_timestamp(t.end)}"
-            confidence_stars = "⭐" * min(5, int(t.confidence * 5))
-
-            markdown.append(f"### [{time_range}] Segment {i}\n")
-            markdown.append(
-                f"**Confidence:** {confidence_stars} ({t.confidence:.2f})\n\n"
-            )
-            markdown.append(f"{t.text}\n\n")
+        fmt = format_timestamp
+        markdown.extend(
+            f"### [{fmt(t.start)} - {fmt(t.end)}] Segment {i}\n"
+            f"**Confidence:** {'⭐' * min(5, int(t.confidence * 5))} ({t.confidence:.2f})\n\n"
+            f"{t.text}\n\n"
+            for i, t in enumerate(transcripts, 1)
+        )
 
     return "".join(markdown)
 
@@ -87,6 +74,7 @@ def create_unified_report(
     video_clip: VideoClip,
     audio_clip: AudioClip,
     model_id: str = "us.amazon.nova-lite-v1:0",
+    raise_errors: bool = False,
 ) -> str:
     """
     Use AI to create a unified, intelligent video report by combining all data.
@@ -97,21 +85,30 @@ def create_unified_report(
         video_clip: VideoClip object with metadata
         audio_clip: AudioClip object with metadata
         model_id: Bedrock model for synthesis
+        raise_errors: Re-raise synthesis failures instead of falling back to
+            the plain merged timeline
 
     Returns:
-        AI-generated unified markdown report
+        AI-generated unified markdown report (plain merged timeline for
+        trivial inputs)
     """
 
-    print("Creating unified report with AI synthesis...")
-
-    # Create bedrock client
-    bedrock = get_aws_client("bedrock-runtime")
-
     # Prepare transcript text
     transcript_text = "\n".join(
-        [f"[{format_timestamp(t.start)}] {t.text}" for t in transcripts]
+        f"[{format_timestamp(t.start)}] {t.text}" for t in transcripts
     )
 
+    # Tiny inputs (e.g. an error fallback and no speech) gain little from
+    # synthesis; format them directly instead of paying for a model call
+    if len(visual_analysis) < 500 and len(transcript_text.split()) < 50:
+        print("Inputs too small for synthesis, merging timeline directly")
+        return merge_timeline(visual_analysis, transcripts, video_clip.end)
+
+    print("Creating unified report with AI synthesis...")
+
+    # Create bedrock client
+    bedrock = get_client("bedrock-runtime")
+
     # Create prompt for synthesis
     prompt = f"""You are a professional sports video analyst. 
     You have analyzed a video using both visual and audio analysis.
@@ -143,7 +140,7 @@ def create_unified_report(
     """
 
     try:
-        response = bedrock.converse(
+        response = bedrock.converse_stream(
             modelId=model_id,
             messages=[{"role": "user", "content": [{"text": prompt}]}],
             inferenceConfig={
@@ -152,12 +149,14 @@ def create_unified_report(
             },
         )
 
-        unified_report = response["output"]["message"]["content"][0]["text"]
+        unified_report = collect_stream_text(response)
         print("✓ Unified report generated!")
         return unified_report
 
     except Exception as e:
         print(f"Error creating unified report: {e}")
+        if raise_errors:
+            raise
         # Fallback to simple merge
         return merge_timeline(visual_analysis, transcripts, video_clip.end)
 
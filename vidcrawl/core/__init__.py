@@ -1,4 +1,11 @@
 from .datamodel import *
-from ._transform import separator
+from ._transform import (
+    separator,
+    get_duration,
+    extract_audio,
+    extract_video,
+    clear_bucket,
+)
 from ._llm import analyse_images
 from ._audio import transcribe_audio_s3
+from ._batch import analyse_videos_batch
@@ -1,32 +1,40 @@
-from typing import List
-import boto3
-import os
-from dotenv import load_dotenv
+from typing import Iterator, List
 
+from ._aws import get_client
 from .datamodel import AudioClip, Transcript
 
-load_dotenv()
+s3 = get_client("s3")
+transcribe = get_client("transcribe")
 
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-    region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-)
-transcribe = boto3.client(
-    "transcribe",
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-    region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-)
+
+def iter_transcript_items(transcript_uri: str) -> Iterator[dict]:
+    """
+    Yield the timed items of a Transcribe result document.
+
+    When ijson is installed the items are parsed incrementally from the HTTP
+    response, so peak memory stays O(item) for long transcripts; otherwise
+    the whole document is loaded with json.
+    """
+    import json
+    import urllib.request
+
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    with urllib.request.urlopen(transcript_uri) as response:
+        if ijson is not None:
+            yield from ijson.items(response, "results.items.item")
+        else:
+            yield from json.load(response)["results"].get("items", [])
 
 
 def transcribe_audio_s3(
     audio_clip: AudioClip,
     bucket_name: str = "aws-hack-bucket",
     language_code: str = "en-US",
+    raise_errors: bool = False,
 ) -> List[Transcript]:
     """
     Transcribe audio from S3 using AWS Transcribe.
@@ -35,12 +43,13 @@ def transcribe_audio_s3(
         audio_clip: AudioClip with S3 paths
         bucket_name: S3 bucket name
         language_code: Language code (en-US, es-ES, etc.)
+        raise_errors: Re-raise failures instead of returning an empty list,
+            so callers can tell a failed job from a video without speech
 
     Returns:
         List of Transcript objects with timestamps
     """
     import time
-    import json
 
     if not audio_clip.audio_data:
         print("No audio data to transcribe")
@@ -68,6 +77,7 @@ def transcribe_audio_s3(
 
         # Wait for completion
         print("Waiting for transcription to complete...")
+        delay = 1.0
         while True:
             status = transcribe.get_transcription_job(TranscriptionJobName=job_name)
             job_status = status["TranscriptionJob"]["TranscriptionJobStatus"]
@@ -79,25 +89,23 @@ def transcribe_audio_s3(
                 error = status["TranscriptionJob"].get("FailureReason", "Unknown error")
                 raise Exception(f"Transcription failed: {error}")
 
-            time.sleep(5)  # Check every 5 seconds
+            # Back off from 1s up to 10s between checks
+            time.sleep(delay)
+            delay = min(delay * 1.5, 10.0)
 
         # Get transcript URL
         transcript_uri = status["TranscriptionJob"]["Transcript"]["TranscriptFileUri"]
 
-        # Download and parse transcript
-        import urllib.request
-
-        with urllib.request.urlopen(transcript_uri) as response:
-            transcript_json = json.loads(response.read())
-
         # Parse into Transcript objects
         transcripts = []
 
-        # Get items with timestamps
-        items = transcript_json["results"].get("items", [])
+        # Get items with timestamps (streamed from the download)
+        items = iter_transcript_items(transcript_uri)
 
-        # Group by segments (sentences/phrases)
-        current_text = []
+        # Group by segments (sentences/phrases). Words and punctuation are
+        # buffered as separate parts and joined once per segment.
+        parts = []
+        word_count = 0
         current_start = None
         current_end = None
 
@@ -110,44 +118,50 @@ def transcribe_audio_s3(
 
                 if current_start is None:
                     current_start = start_time
+                else:
+                    parts.append(" ")
 
-                current_text.append(word)
+                parts.append(word)
+                word_count += 1
                 current_end = end_time
 
                 # Create segment every ~10 words or at punctuation
-                if len(current_text) >= 10:
+                if word_count >= 10:
                     transcripts.append(
                         Transcript(
-                            text=" ".join(current_text),
+                            text="".join(parts),
                             start=audio_clip.start + current_start,
                             end=audio_clip.start + current_end,
                             confidence=confidence,
                         )
                     )
-                    current_text = []
+                    parts = []
+                    word_count = 0
                     current_start = None
 
-            elif item["type"] == "punctuation" and current_text:
+            elif item["type"] == "punctuation" and parts:
                 # End segment at punctuation
-                current_text[-1] += item["alternatives"][0]["content"]
+                mark = item["alternatives"][0]["content"]
+                parts.append(mark)
 
-                if item["alternatives"][0]["content"] in [".", "!", "?"]:
+                if mark in [".", "!", "?"]:
                     transcripts.append(
                         Transcript(
-                            text=" ".join(current_text),
+                            text="".join(parts),
                             start=audio_clip.start + current_start,
                             end=audio_clip.start + current_end,
                             confidence=1.0,
                         )
                     )
-                    current_text = []
+                    parts = []
+                    word_count = 0
                     current_start = None
 
         # Add remaining text
-        if current_text:
+        if parts:
             transcripts.append(
                 Transcript(
-                    text=" ".join(current_text),
+                    text="".join(parts),
                     start=audio_clip.start + current_start,
                     end=audio_clip.start + current_end,
                     confidence=1.0,
@@ -171,4 +185,6 @@ def transcribe_audio_s3(
             transcribe.delete_transcription_job(TranscriptionJobName=job_name)
         except:
             pass
+        if raise_errors:
+            raise
         return []
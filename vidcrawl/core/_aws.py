@@ -0,0 +1,26 @@
+from functools import lru_cache
+import boto3
+import os
+
+from ._config import BOTO_CONFIG
+
+
+@lru_cache(maxsize=None)
+def get_client(service_name: str):
+    """Return the shared boto3 client for a service, creating it on first use.
+
+    boto3 clients are thread-safe, so one client (and its connection pool) is
+    reused by every module instead of each building its own.
+    """
+    try:
+        return boto3.client(
+            service_name,
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+            aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
+            region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
+            config=BOTO_CONFIG,
+        )
+    except Exception as e:
+        print(f"Failed to create {service_name} client: {e}")
+        raise
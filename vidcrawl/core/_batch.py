@@ -0,0 +1,124 @@
+from typing import List
+import json
+import time
+from ._aws import get_client
+from ._llm import create_images_prompt
+from .datamodel import VideoClip
+
+s3 = get_client("s3")
+bedrock = get_client("bedrock")
+
+
+def analyse_videos_batch(
+    videos: List[VideoClip],
+    role_arn: str,
+    model_id: str = "us.amazon.nova-lite-v1:0",
+    max_frames: int = 100,
+    bucket_name: str = "aws-hack-bucket",
+    poll_timeout: float = 24 * 3600,
+) -> List[str]:
+    """
+    Analyze many videos offline with Bedrock Batch Inference.
+
+    Batch jobs cost about half as much as on-demand calls and are not bound by
+    online throughput quotas, but take minutes to hours to complete. Use this
+    for bulk workloads; interactive analysis should use analyse_images().
+    Bedrock enforces a minimum number of records per job (100 for most
+    models), so submit videos in bulk.
+
+    Args:
+        videos:
+            One VideoClip per video, with keyframes already uploaded to S3
+        role_arn:
+            IAM service role Bedrock assumes to read and write the bucket
+        model_id:
+            Bedrock model ID
+        max_frames:
+            Maximum frames per video
+        bucket_name:
+            S3 bucket for the job input and output
+        poll_timeout:
+            Seconds to wait for the job before giving up
+
+    Returns:
+        Visual analysis text per video, in input order ("" for failed records)
+    """
+
+    job_name = f"vidcrawl-batch-{int(time.time())}"
+    input_key = f"batch/{job_name}/input.jsonl"
+    output_prefix = f"batch/{job_name}/output/"
+
+    # 1. Write one record per video; batch input can't carry inline bytes,
+    # so frames are referenced by S3 location
+    records = []
+    for idx, clip in enumerate(videos):
+        content = create_images_prompt([clip], max_frames, inline=False)
+        records.append(
+            json.dumps(
+                {
+                    "recordId": f"video_{idx:06d}",
+                    "modelInput": {
+                        "schemaVersion": "messages-v1",
+                        "messages": [{"role": "user", "content": content}],
+                        "inferenceConfig": {
+                            "max_new_tokens": 4000,
+                            "temperature": 0.3,
+                        },
+                    },
+                }
+            )
+        )
+    s3.put_object(
+        Bucket=bucket_name, Key=input_key, Body="\n".join(records).encode("utf-8")
+    )
+
+    # 2. Submit the job
+    print(f"Submitting batch job {job_name} with {len(records)} records...")
+    job = bedrock.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=role_arn,
+        modelId=model_id,
+        inputDataConfig={
+            "s3InputDataConfig": {"s3Uri": f"s3://{bucket_name}/{input_key}"}
+        },
+        outputDataConfig={
+            "s3OutputDataConfig": {"s3Uri": f"s3://{bucket_name}/{output_prefix}"}
+        },
+    )
+    job_arn = job["jobArn"]
+
+    # 3. Wait for completion, backing off up to 5 minutes between checks
+    delay = 10.0
+    deadline = time.time() + poll_timeout
+    while True:
+        status = bedrock.get_model_invocation_job(jobIdentifier=job_arn)["status"]
+        if status == "Completed" or status == "PartiallyCompleted":
+            print(f"✓ Batch job {status.lower()}")
+            break
+        elif status in ("Failed", "Stopped", "Expired"):
+            raise Exception(f"Batch job {job_name} ended with status {status}")
+        elif time.time() > deadline:
+            raise TimeoutError(f"Batch job {job_name} still {status}")
+
+        time.sleep(delay)
+        delay = min(delay * 1.5, 300.0)
+
+    # 4. Read results; Bedrock writes <input file>.jsonl.out under a job folder
+    results = {}
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=output_prefix):
+        for obj in page.get("Contents", []):
+            if not obj["Key"].endswith(".jsonl.out"):
+                continue
+            body = s3.get_object(Bucket=bucket_name, Key=obj["Key"])["Body"]
+            for line in body.iter_lines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                output = record.get("modelOutput", {}).get("output", {})
+                content = output.get("message", {}).get("content", [])
+                results[record["recordId"]] = "".join(
+                    block.get("text", "") for block in content
+                )
+
+    return [results.get(f"video_{idx:06d}", "") for idx in range(len(videos))]
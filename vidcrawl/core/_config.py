@@ -0,0 +1,21 @@
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# Shared botocore settings: a larger keep-alive pool so concurrent uploads and
+# model calls reuse TCP/TLS sessions, plus adaptive client-side retries.
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    connect_timeout=5,
+    read_timeout=120,
+)
+
+# Settings for the shared S3 transfer manager: up to 32 concurrent requests
+# (whole keyframes or 8 MiB parts of larger objects like the audio track).
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 << 20,
+    multipart_chunksize=8 << 20,
+    max_concurrency=32,
+    use_threads=True,
+)
@@ -1,21 +1,28 @@
-from typing import List, Union
-import boto3
-import os
-from dotenv import load_dotenv
+from typing import Dict, List, Tuple, Union
+from ._aws import get_client
 from .datamodel import VideoClip
 
-load_dotenv()
+bedrock = get_client("bedrock-runtime")
 
-bedrock = boto3.client(
-    "bedrock-runtime",
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-    region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-)
+# Visual analysis results keyed by keyframe content hash and timestamps;
+# the oldest entries are evicted beyond _ANALYSIS_CACHE_MAX
+_ANALYSIS_CACHE_MAX = 128
+_analysis_cache: Dict[Tuple, str] = {}
 
 
-def create_images_prompt(video_clips: List[VideoClip], max_frames: int = 100) -> list:
+def collect_stream_text(response) -> str:
+    """Accumulate the text deltas of a ``converse_stream`` response."""
+    chunks = []
+    for event in response["stream"]:
+        text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+        if text:
+            chunks.append(text)
+    return "".join(chunks)
+
+
+def create_images_prompt(
+    video_clips: List[VideoClip], max_frames: int = 100, inline: bool = True
+) -> list:
     """Create content with frames from video clips.
 
     Args:
@@ -23,6 +30,9 @@ def create_images_prompt(video_clips: List[VideoClip], max_frames: int = 100) ->
             List of VideoClip objects
         max_frames:
             Maximum total frames to send (to avoid token limits)
+        inline:
+            Embed JPEG bytes when the clip carries them; otherwise always
+            reference the frames by S3 location
     """
     content = [
         {
@@ -53,7 +63,7 @@ def create_images_prompt(video_clips: List[VideoClip], max_frames: int = 100) ->
         selected_frames = clip.keyframes[:frames_per_clip]
 
         # Use stored timestamps if available, otherwise calculate
-        if clip.timestamps and len(clip.timestamps) == len(clip.keyframes):
+        if clip.timestamps is not None and len(clip.timestamps) == len(clip.keyframes):
             frame_times = clip.timestamps[:frames_per_clip]
         else:
             # Fallback: calculate approximate timestamp for each frame within the clip
@@ -73,8 +83,7 @@ def create_images_prompt(video_clips: List[VideoClip], max_frames: int = 100) ->
                 frame_timestamps.append(frame_time)
 
                 # Format timestamp nicely
-                minutes = int(frame_time // 60)
-                seconds = int(frame_time % 60)
+                minutes, seconds = divmod(int(frame_time), 60)
 
                 content.append(
                     {
@@ -82,15 +91,18 @@ def create_images_prompt(video_clips: List[VideoClip], max_frames: int = 100) ->
                     }
                 )
 
-                s3_path = f"s3://aws-hack-bucket/{frame_key}"
-                content.append(
-                    {
-                        "image": {
-                            "format": "jpeg",
-                            "source": {"s3Location": {"uri": s3_path}},
-                        }
-                    }
-                )
+                # Inline the encoded frame when available so Bedrock doesn't
+                # have to fetch each image from S3; otherwise reference it
+                if (
+                    inline
+                    and clip.jpeg_bytes
+                    and len(clip.jpeg_bytes) == len(clip.keyframes)
+                ):
+                    source = {"bytes": clip.jpeg_bytes[idx]}
+                else:
+                    s3_path = f"s3://aws-hack-bucket/{frame_key}"
+                    source = {"s3Location": {"uri": s3_path}}
+                content.append({"image": {"format": "jpeg", "source": source}})
                 total_frames += 1
 
                 # Hard stop at max_frames
@@ -123,6 +135,9 @@ def analyse_images(
     """
     Analyze video clips with optimized settings.
 
+    All selected frames are sent as image blocks in a single ``converse``
+    request, so the per-request overhead is paid once per video.
+
     Args:
         video_clips: 
             Single VideoClip or list of VideoClip objects
@@ -145,10 +160,27 @@ def analyse_images(
             f"Expected VideoClip or List[VideoClip], got {type(video_clips)}"
         )
 
+    # Skip the Bedrock call when these exact frames were analysed before. The
+    # prompt labels each frame with its time, so timestamps are part of the key.
+    cache_key = None
+    if all(clip.content_hash for clip in video_clips):
+        cache_key = (
+            tuple(clip.content_hash for clip in video_clips),
+            tuple(
+                None if clip.timestamps is None else tuple(map(float, clip.timestamps))
+                for clip in video_clips
+            ),
+            model_id,
+            max_frames,
+        )
+        if cache_key in _analysis_cache:
+            print("✓ Using cached visual analysis")
+            return _analysis_cache[cache_key]
+
     content = create_images_prompt(video_clips, max_frames)
 
-    # Use converse() - it's the correct API
-    response = bedrock.converse(
+    # Stream so tokens arrive as generated instead of one long-held read
+    response = bedrock.converse_stream(
         modelId=model_id,
         messages=[{"role": "user", "content": content}],
         inferenceConfig={
@@ -157,4 +189,9 @@ def analyse_images(
         },
     )
 
-    return response["output"]["message"]["content"][0]["text"]
+    analysis = collect_stream_text(response)
+    if cache_key is not None:
+        _analysis_cache[cache_key] = analysis
+        while len(_analysis_cache) > _ANALYSIS_CACHE_MAX:
+            del _analysis_cache[next(iter(_analysis_cache))]
+    return analysis
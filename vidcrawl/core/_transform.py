@@ -1,131 +1,547 @@
-from typing import List, Tuple
-import boto3
+from typing import Callable, Iterator, List, Optional, Tuple
 import os
-from io import BytesIO
+import subprocess
 import tempfile
-import shutil
+from io import BytesIO
+import hashlib
+import heapq
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import cv2
 import numpy as np
 import ffmpeg
+from boto3.s3.transfer import create_transfer_manager
 
+from ._aws import get_client
+from ._config import TRANSFER_CONFIG
 from .datamodel import AudioClip, VideoClip
-from dotenv import load_dotenv
 
-load_dotenv()
+s3 = get_client("s3")
 
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-    aws_session_token=os.getenv("AWS_SESSION_TOKEN"),
-    region_name=os.getenv("AWS_DEFAULT_REGION", "us-east-1"),
-)
+# One transfer manager for every upload: a long-lived worker pool over the
+# shared client's connections instead of a thread pool per call
+transfer_manager = create_transfer_manager(s3, TRANSFER_CONFIG)
 
 
-def calculate_frame_difference(frame1, frame2):
-    """Calculate difference between two frames."""
-    if frame1 is None or frame2 is None:
-        return 0
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image.
 
-    # Convert to grayscale and calculate absolute difference
-    gray1 = cv2.cvtColor(frame1, cv2.COLOR_BGR2GRAY)
-    gray2 = cv2.cvtColor(frame2, cv2.COLOR_BGR2GRAY)
+    Each bit records whether a pixel is brighter than its right-hand
+    neighbour in a 9x8 down-sample, so two hashes compare with a single
+    popcount of their XOR.
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(small[:, 1:] > small[:, :-1]).tobytes(), "big")
 
-    diff = cv2.absdiff(gray1, gray2)
-    return np.mean(diff)
+
+class KeyframeTimestampError(RuntimeError):
+    """Keyframe timestamps couldn't be matched one-to-one to decoded frames."""
+
+
+def iter_keyframes_ffmpeg(
+    video_path: str,
+) -> Iterator[Tuple[int, float, np.ndarray, Callable[[], np.ndarray]]]:
+    """Yield only the video's keyframes, decoded by ffmpeg.
+
+    Timestamps come from a demux-only ffprobe pass over the keyframe
+    packets, run to completion first, and are relative to the stream start.
+    ffmpeg is then told to skip every non-key frame before decoding and
+    streams the rest as MJPEG.
+
+    Raises:
+        KeyframeTimestampError: ffprobe failed, or it counted a different
+            number of keyframes than ffmpeg decoded. Raised as soon as the
+            counts diverge, so callers must discard frames already yielded.
+    """
+    try:
+        probe = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "packet=pts_time,flags:stream=start_time",
+                "-of", "csv",
+                video_path,
+            ],  # fmt: skip
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+    except OSError as e:
+        raise KeyframeTimestampError(f"ffprobe unavailable: {e}") from e
+    if probe.returncode != 0:
+        raise KeyframeTimestampError(f"ffprobe exited with {probe.returncode}")
+
+    # Rows are "packet,<pts_time>,<flags>" and "stream,<start_time>". Times
+    # are made relative to the stream start, like the other decode paths.
+    start = 0.0
+    times = []
+    for line in probe.stdout.splitlines():
+        fields = line.split(",")
+        if fields[0] == "packet" and len(fields) >= 3:
+            if "K" in fields[2] and fields[1] != "N/A":
+                times.append(float(fields[1]))
+        elif fields[0] == "stream" and len(fields) >= 2 and fields[1] != "N/A":
+            start = float(fields[1])
+    times = sorted(t - start for t in times)
+    if not times:
+        raise KeyframeTimestampError("ffprobe reported no keyframe timestamps")
+
+    decode = subprocess.Popen(
+        [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-skip_frame", "nokey", "-i", video_path,
+            "-map", "0:v:0", "-vsync", "0",
+            "-f", "image2pipe", "-vcodec", "mjpeg", "-q:v", "2", "pipe:1",
+        ],  # fmt: skip
+        stdout=subprocess.PIPE,
+        bufsize=1 << 20,
+    )
+
+    # Frames are split on the JPEG end-of-image marker, which can't occur
+    # inside entropy-coded data
+    buf = bytearray()
+    frame_num = 0
+    try:
+        while chunk := decode.stdout.read1(1 << 20):
+            buf += chunk
+            while (end := buf.find(b"\xff\xd9")) != -1:
+                jpeg = np.frombuffer(bytes(buf[: end + 2]), np.uint8)
+                del buf[: end + 2]
+                if frame_num >= len(times):
+                    raise KeyframeTimestampError(
+                        f"ffmpeg decoded more than {len(times)} keyframes"
+                    )
+                yield (
+                    frame_num,
+                    times[frame_num],
+                    cv2.imdecode(jpeg, cv2.IMREAD_GRAYSCALE),
+                    lambda jpeg=jpeg: cv2.imdecode(jpeg, cv2.IMREAD_COLOR),
+                )
+                frame_num += 1
+        if frame_num != len(times):
+            raise KeyframeTimestampError(
+                f"ffmpeg decoded {frame_num} of {len(times)} keyframes"
+            )
+    finally:
+        decode.stdout.close()
+        decode.kill()
+        decode.wait()
+
+
+def iter_keyframes_av(
+    video_path: str,
+) -> Iterator[Tuple[int, float, np.ndarray, Callable[[], np.ndarray]]]:
+    """Yield only the video's keyframes, decoded in-process by PyAV.
+
+    libavcodec is told to skip every non-key frame, so P/B frames are never
+    decoded.
+
+    Raises:
+        KeyframeTimestampError: a keyframe carries no timestamp
+    """
+    import av
+
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        stream.codec_context.skip_frame = "NONKEY"
+        # Frame times include the stream's start offset (non-zero in MPEG-TS
+        # or MP4 edit lists); the rest of the pipeline starts at 0
+        start = (
+            float(stream.start_time * stream.time_base)
+            if stream.start_time is not None
+            else 0.0
+        )
+        for frame_num, av_frame in enumerate(container.decode(stream)):
+            if av_frame.time is None:
+                raise KeyframeTimestampError(f"keyframe {frame_num} has no timestamp")
+            yield (
+                frame_num,
+                av_frame.time - start,
+                av_frame.to_ndarray(format="gray"),
+                lambda av_frame=av_frame: av_frame.to_ndarray(format="bgr24"),
+            )
+
+
+def iter_sampled_frames(
+    video_path: str, sample_rate: int, keyframes_only: bool = False
+) -> Iterator[Tuple[int, float, np.ndarray, Callable[[], np.ndarray]]]:
+    """Yield every `sample_rate`-th frame of the video in decode order.
+
+    Frames are decoded with OpenCV's grab()/retrieve() pair. With
+    `keyframes_only` the decoder skips every non-key frame (through PyAV
+    when installed, otherwise an ffmpeg subprocess) and all keyframes are
+    yielded (`sample_rate` is ignored).
+
+    Yields:
+        Tuples of (frame_num, timestamp, gray, get_bgr). `gray` and the array
+        returned by `get_bgr()` may be reused buffers, valid only until the
+        next frame is yielded.
+    """
+    if keyframes_only:
+        try:
+            import av
+        except ImportError:
+            av = None
+
+        if av is not None:
+            yield from iter_keyframes_av(video_path)
+        else:
+            yield from iter_keyframes_ffmpeg(video_path)
+        return
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+
+    # grab() advances without the colour conversion; retrieve() is only paid
+    # on sampled frames. Seeking per sample made the decoder rewind to the
+    # previous keyframe.
+    frame_buf = None
+    gray_full = None
+    frame_num = -1
+    try:
+        while cap.grab():
+            frame_num += 1
+            if frame_num % sample_rate:
+                continue
+            # Decode into the same buffer every time (allocated on first use)
+            ret, frame_buf = cap.retrieve(frame_buf)
+            if not ret:
+                break
+            gray_full = cv2.cvtColor(frame_buf, cv2.COLOR_BGR2GRAY, dst=gray_full)
+            yield frame_num, frame_num / fps, gray_full, lambda: frame_buf
+    finally:
+        cap.release()
 
 
 def extract_best_frames_fast(
     video_path: str,
-    output_dir: str,
     num_frames: int = 50,
-    sample_rate: int = 20  # Increase for speed
-) -> List[Tuple[str, float]]:
+    sample_rate: int = 20,  # Increase for speed
+    scene_threshold: float = 0.1,
+    max_gap: int = 10,
+    max_side: int = 1024,
+    on_encoded: Optional[Callable[[bytes, float], None]] = None,
+    keyframes_only: bool = False,
+) -> List[Tuple[bytes, float]]:
     """
-    Optimized frame extraction using direct seeking.
+    Optimized frame extraction in one sequential pass.
     
     IMPROVEMENTS:
-    - Seek directly to frame positions (don't read all frames)
+    - Single sequential decode pass (no per-sample seeks or re-reads)
     - Higher sample rate (20 instead of 10)
-    - Parallel frame saving
+    - Scene-change gating: near-duplicate samples within a shot are only
+      used to fill slots left empty once the scene changes and every
+      `max_gap`-th sample have been taken
+    - Parallel in-memory JPEG encoding (no temp files); relies on OpenCV's
+      libjpeg-turbo backend (bundled with the opencv-python wheels) for SIMD
+    - Frames down-scaled to `max_side` pixels before encoding (Bedrock
+      resizes larger images anyway)
     - Lower JPEG quality for faster I/O    
+    - `on_encoded(jpeg_bytes, timestamp)` is called as each frame finishes
+      encoding, so callers can start uploading before the batch is done
+    - `keyframes_only` scores just the I-frames, never decoding P/B frames;
+      falls back to the full scan if there are fewer keyframes than
+      `num_frames` or their timestamps can't be matched to the frames
+
+    Returns:
+        List of (jpeg_bytes, timestamp) sorted by timestamp
     """
     
-    os.makedirs(output_dir, exist_ok=True)
-    
-    cap = cv2.VideoCapture(video_path)
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if keyframes_only:
+        print("Optimized extraction: sampling keyframes only")
+    else:
+        print(f"Optimized extraction: sampling every {sample_rate} frames")
     
-    print(f"Optimized extraction: sampling every {sample_rate} frames")
+    # Min-heap of the best candidates so far: (score, -frame_num, timestamp,
+    # frame). Only these frames are kept, already down-scaled, so Phase 2
+    # never has to seek back into the video. Samples dropped by the scene
+    # gate go to `spare`, capped so both heaps together never hold more than
+    # num_frames; they fill whatever slots `best` leaves empty.
+    best = []
+    spare = []
+    prev_hist = None
+    prev_hash = None
     
-    frame_scores = []
-    prev_frame = None
+    # Reused 64x64 thumbnail that both the scene gate and the hash work on
+    small = np.empty((64, 64), np.uint8)
     
-    # Phase 1: Score frames (with seeking)
-    for frame_num in range(0, total_frames, sample_rate):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
-        ret, frame = cap.read()
-        if not ret:
-            break
+    # Phase 1: Score frames in one sequential pass
+    sample_idx = -1
+    frames = iter_sampled_frames(video_path, sample_rate, keyframes_only)
+    try:
+        for sample_idx, (frame_num, timestamp, gray, get_bgr) in enumerate(frames):
+            cv2.resize(gray, (64, 64), dst=small, interpolation=cv2.INTER_AREA)
         
-        # Simple scoring (can be even faster with lower resolution)
-        if prev_frame is not None:
-            gray1 = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            score = np.mean(cv2.absdiff(gray1, gray2))
-        else:
-            score = 0
+            # Scene-change gate on the thumbnail's grayscale histogram
+            hist = cv2.calcHist([small], [0], None, [64], [0, 256])
+            cv2.normalize(hist, hist)
+            is_scene_change = prev_hist is None or (
+                cv2.compareHist(prev_hist, hist, cv2.HISTCMP_BHATTACHARYYA)
+                > scene_threshold
+            )
+            prev_hist = hist
         
-        frame_scores.append({
-            'frame_num': frame_num,
-            'timestamp': frame_num / fps,
-            'score': score,
-        })
-        prev_frame = frame
+            # Difference score: Hamming distance to the previous sample's dHash
+            frame_hash = dhash(small)
+            score = 0 if prev_hash is None else (frame_hash ^ prev_hash).bit_count()
+            prev_hash = frame_hash
+        
+            gated = not is_scene_change and sample_idx % max_gap != 0
+            if gated:
+                heap, capacity = spare, num_frames - len(best)
+            else:
+                heap, capacity = best, num_frames
+            if capacity == 0:
+                continue
+        
+            if len(heap) == capacity and (score, -frame_num) <= heap[0][:2]:
+                continue
+        
+            # Colour is only materialised for frames that make the cut. Kept
+            # frames must not alias the reused decode buffer.
+            frame = get_bgr()
+            h, w = frame.shape[:2]
+            scale = max_side / max(h, w)
+            if scale < 1:
+                frame = cv2.resize(
+                    frame,
+                    (int(w * scale), int(h * scale)),
+                    interpolation=cv2.INTER_AREA,
+                )
+            else:
+                frame = frame.copy()
+        
+            entry = (score, -frame_num, timestamp, frame)
+            if len(heap) < capacity:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heapreplace(heap, entry)
+            while len(spare) > num_frames - len(best):
+                heapq.heappop(spare)
+    except KeyframeTimestampError as e:
+        # Mislabelled frames would put wrong times in the prompt
+        print(f"Keyframe timestamps unreliable ({e}), rescanning all frames")
+        return extract_best_frames_fast(
+            video_path,
+            num_frames,
+            sample_rate,
+            scene_threshold,
+            max_gap,
+            max_side,
+            on_encoded,
+        )
     
-    cap.release()
+    if keyframes_only and sample_idx + 1 < num_frames:
+        print(f"Only {sample_idx + 1} keyframes found, rescanning all frames")
+        return extract_best_frames_fast(
+            video_path,
+            num_frames,
+            sample_rate,
+            scene_threshold,
+            max_gap,
+            max_side,
+            on_encoded,
+        )
     
-    # Phase 2: Select and save best frames
-    frame_scores.sort(key=lambda x: x['score'], reverse=True)
-    selected = frame_scores[:num_frames]
-    selected.sort(key=lambda x: x['frame_num'])
+    # Top up with the best gated-out samples so num_frames are returned
+    # whenever the video has that many samples
+    best.extend(spare)
     
-    # Phase 3: Parallel frame extraction and saving
-    def extract_and_save(frame_info, idx):
-        cap_local = cv2.VideoCapture(video_path)
-        cap_local.set(cv2.CAP_PROP_POS_FRAMES, frame_info['frame_num'])
-        ret, frame = cap_local.read()
-        cap_local.release()
-        
-        if ret:
-            output_path = os.path.join(output_dir, f"frame_{idx:04d}.jpg")
-            # Lower quality for faster I/O (80 instead of 95)
-            cv2.imwrite(output_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            return (output_path, frame_info['timestamp'])
+    # Phase 2: Parallel encoding of the selected frames
+    def encode(entry):
+        _, _, timestamp, frame = entry
+        # Encode once; the bytes are reused for hashing and upload.
+        # Lower quality for faster I/O (75 instead of 95)
+        ok, buf = cv2.imencode(
+            ".jpg",
+            frame,
+            [cv2.IMWRITE_JPEG_QUALITY, 75, cv2.IMWRITE_JPEG_OPTIMIZE, 0],
+        )
+        if ok:
+            return (buf.tobytes(), timestamp)
         return None
     
     keyframe_data = []
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = [
-            executor.submit(extract_and_save, info, idx)
-            for idx, info in enumerate(selected)
-        ]
+    # imencode releases the GIL, so encoding scales with cores
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+        futures = [executor.submit(encode, entry) for entry in best]
         for future in as_completed(futures):
             result = future.result()
             if result:
                 keyframe_data.append(result)
+                if on_encoded is not None:
+                    on_encoded(*result)
     
     # Sort by timestamp
     keyframe_data.sort(key=lambda x: x[1])
     return keyframe_data
 
+
+def get_duration(video_path: str) -> float:
+    """Return the video duration in seconds.
+
+    Read from the container metadata through OpenCV in-process; ffprobe is
+    only spawned when the frame count or frame rate isn't reported.
+    """
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    cap.release()
+
+    if fps > 0 and total_frames > 0:
+        return total_frames / fps
+
+    probe = ffmpeg.probe(video_path)
+    return float(probe["format"]["duration"])
+
+
+def audio_extract_cmd(video_path: str, output: str = "pipe:1") -> List[str]:
+    """ffmpeg argv that writes the video's audio track as MP3 to `output`.
+
+    Built as a plain list rather than through an ffmpeg-python graph, which
+    is re-assembled and compiled to the same argv on every call.
+    """
+    return [
+        "ffmpeg", "-nostdin", "-y", "-i", video_path,
+        "-vn", "-acodec", "libmp3lame", "-f", "mp3", output,
+    ]  # fmt: skip
+
+
+def extract_audio(video_path: str, duration: float) -> AudioClip:
+    """Extract the full audio track as MP3 and upload it to S3.
+
+    Args:
+        video_path:
+            Path to video file
+        duration:
+            Video duration in seconds
+
+    Returns:
+        AudioClip for the entire video
+    """
+
+    # ffmpeg writes straight to a temp file that is uploaded from disk in
+    # parts, so the MP3 is never held in memory
+    fd, audio_path = tempfile.mkstemp(suffix=".mp3")
+    os.close(fd)
+    try:
+        print("Extracting audio...")
+        subprocess.run(
+            audio_extract_cmd(video_path, audio_path),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+
+        print("Uploading audio to S3...")
+        transfer_manager.upload(
+            audio_path,
+            "aws-hack-bucket",
+            f"audio/video_full.mp3",
+        ).result()
+    finally:
+        os.remove(audio_path)
+
+    return AudioClip(
+        audio_data=[f"audio/video_full.mp3"],
+        start=0,
+        end=duration,
+        source_cut=None,
+    )
+
+
+def extract_video(
+    video_path: str,
+    duration: float,
+    num_frames: int = 40,
+    sample_rate: int = 10,
+    max_side: int = 1024,
+    keyframes_only: bool = False,
+) -> VideoClip:
+    """Extract the best keyframes and upload them to S3.
+
+    Keyframes are stored under content-addressed keys (keyframes/<digest>.jpg)
+    that are never overwritten, so the prefix grows by up to `num_frames`
+    objects per new video; empty the bucket with `clear_bucket` between runs.
+
+    Args:
+        video_path:
+            Path to video file
+        duration:
+            Video duration in seconds
+        num_frames:
+            Number of keyframes to extract
+        sample_rate:
+            Analyze every Nth frame (10 = 10x faster)
+        max_side:
+            Longest side of the encoded keyframes in pixels (e.g. 672 to
+            match smaller model inputs)
+        keyframes_only:
+            Score only the video's keyframes (much faster on long videos)
+
+    Returns:
+        VideoClip for the entire video
+    """
+
+    print(f"Extracting {num_frames} best frames (sample rate: 1/{sample_rate})...")
+
+    # Each frame is named by its own digest, so identical frames map to the
+    # same key and re-uploading one is idempotent; its upload starts as soon
+    # as it is encoded. Keys are looked up by the bytes they were derived
+    # from, which can't collide the way timestamps can.
+    key_for = {}
+    upload_futures = []
+
+    def upload_encoded(data: bytes, timestamp: float):
+        key = f"keyframes/{hashlib.blake2b(data, digest_size=16).hexdigest()}.jpg"
+        key_for[data] = key
+        upload_futures.append(
+            transfer_manager.upload(BytesIO(data), "aws-hack-bucket", key)
+        )
+
+    keyframe_data = extract_best_frames_fast(
+        video_path=video_path,
+        num_frames=num_frames,
+        sample_rate=sample_rate,
+        max_side=max_side,
+        on_encoded=upload_encoded,
+        keyframes_only=keyframes_only,
+    )
+    jpeg_bytes = [data for data, _ in keyframe_data]
+    keyframe_keys = [key_for[data] for data in jpeg_bytes]
+
+    # Digest keyframe bytes so downstream analysis can be memoized
+    frames_hash = hashlib.blake2b(digest_size=16)
+    for data in jpeg_bytes:
+        frames_hash.update(data)
+
+    # Wait for all uploads
+    for future in upload_futures:
+        future.result()
+    print(f"Uploaded {len(upload_futures)} keyframes to S3")
+
+    # Store both keyframe paths and their timestamps
+    return VideoClip(
+        start=0,
+        end=duration,
+        keyframes=keyframe_keys,
+        timestamps=[timestamp for _, timestamp in keyframe_data],  # Add timestamps
+        source_cut=None,
+        content_hash=frames_hash.hexdigest(),
+        jpeg_bytes=jpeg_bytes,
+    )
+
+
 def separator(
-    video_path: str, num_frames: int = 40, sample_rate: int = 10
+    video_path: str,
+    num_frames: int = 40,
+    sample_rate: int = 10,
+    keyframes_only: bool = False,
 ) -> Tuple[AudioClip, VideoClip]:
     """Extract best frames and audio from entire video (fast version).
 
+    Audio and keyframes are extracted and uploaded concurrently. Callers that
+    want to start analysis on one stream before the other finishes can use
+    `extract_audio` and `extract_video` directly.
+
     Args:
         video_path:
             Path to video file
@@ -133,87 +549,54 @@ def separator(
             Number of keyframes to extract
         sample_rate:
             Analyze every Nth frame (10 = 10x faster)
+        keyframes_only:
+            Score only the video's keyframes instead of every Nth frame
 
     Returns:
         Tuple of (AudioClip, VideoClip) for the entire video
     """
 
     print(f"Processing video: {video_path}")
-    print(f"Extracting {num_frames} best frames (sample rate: 1/{sample_rate})...")
 
-    temp_dir = tempfile.mkdtemp()
-    keyframes_dir = os.path.join(temp_dir, "keyframes")
-    os.makedirs(keyframes_dir, exist_ok=True)
+    duration = get_duration(video_path)
 
-    try:
-        # 1. Extract best frames (fast!)
-        keyframe_data = extract_best_frames_fast(
-            video_path=video_path,
-            output_dir=keyframes_dir,
-            num_frames=num_frames,
-            sample_rate=sample_rate,
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        audio_future = executor.submit(extract_audio, video_path, duration)
+        video_future = executor.submit(
+            extract_video,
+            video_path,
+            duration,
+            num_frames,
+            sample_rate,
+            keyframes_only=keyframes_only,
         )
+        audio_clip = audio_future.result()
+        video_clip = video_future.result()
 
-        # 2. Get video duration
-        probe = ffmpeg.probe(video_path)
-        duration = float(probe["format"]["duration"])
+    print("✓ Processing complete!")
+    return audio_clip, video_clip
 
-        # 3. Extract audio from entire video
-        print("Extracting audio...")
-        audio_out, _ = (
-            ffmpeg.input(video_path)
-            .output("pipe:", format="mp3", acodec="libmp3lame", vn=None)
-            .run(capture_stdout=True, capture_stderr=True)
-        )
-
-        # 4. Upload to S3 in parallel
-        print("Uploading to S3...")
-        with ThreadPoolExecutor(max_workers=16) as upload_executor:
-            upload_futures = []
-
-            # Upload keyframes
-            for idx, (kf_path, timestamp) in enumerate(keyframe_data):
-                future = upload_executor.submit(
-                    s3.upload_file,
-                    kf_path,
-                    "aws-hack-bucket",
-                    f"keyframes/video_{idx}.jpg",
-                )
-                upload_futures.append(future)
-
-            # Upload audio
-            audio_future = upload_executor.submit(
-                s3.upload_fileobj,
-                BytesIO(audio_out),
-                "aws-hack-bucket",
-                f"audio/video_full.mp3",
-            )
-            upload_futures.append(audio_future)
 
-            # Wait for all uploads
-            for future in upload_futures:
-                future.result()
+def clear_bucket(bucket_name: str = "aws-hack-bucket") -> int:
+    """Delete every object in the bucket using batched DeleteObjects calls.
 
-        audio_clip = AudioClip(
-            audio_data=[f"audio/video_full.mp3"],
-            start=0,
-            end=duration,
-            source_cut=None,
-        )
+    Args:
+        bucket_name:
+            S3 bucket to empty
 
-        # Store both keyframe paths and their timestamps
-        video_clip = VideoClip(
-            start=0,
-            end=duration,
-            keyframes=[
-                f"keyframes/video_{idx}.jpg" for idx in range(len(keyframe_data))
-            ],
-            timestamps=[timestamp for _, timestamp in keyframe_data],  # Add timestamps
-            source_cut=None,
-        )
+    Returns:
+        Number of objects deleted
+    """
 
-        print("✓ Processing complete!")
-        return audio_clip, video_clip
+    deleted = 0
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name):
+        # Pages hold at most 1000 keys, the DeleteObjects limit
+        keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+        if keys:
+            s3.delete_objects(
+                Bucket=bucket_name, Delete={"Objects": keys, "Quiet": True}
+            )
+            deleted += len(keys)
 
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+    return deleted
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
 
 
 @dataclass
@@ -32,8 +34,28 @@ class VideoClip:
     start: float
     end: float
     keyframes: List[str]  # S3 paths to keyframe images
-    timestamps: Optional[List[float]] = None  # Timestamp for each keyframe
+    # Seconds, one per keyframe; any sequence is stored as a float64 array.
+    # Left out of == since arrays have no single truth value.
+    timestamps: Optional[Union[Sequence[float], np.ndarray]] = field(
+        default=None, compare=False
+    )
     source_cut: Optional[VideoCut] = None
+    content_hash: Optional[str] = None  # Digest of the keyframe JPEG bytes
+    jpeg_bytes: Optional[List[bytes]] = None  # Encoded keyframes, same order
+
+    def __post_init__(self):
+        # Keep keyframes, timestamps and bytes in time order
+        if self.timestamps is None:
+            return
+        self.timestamps = np.asarray(self.timestamps, dtype=np.float64)
+        if len(self.timestamps) != len(self.keyframes):
+            return
+        if np.any(self.timestamps[1:] < self.timestamps[:-1]):
+            order = np.argsort(self.timestamps, kind="stable")
+            self.timestamps = self.timestamps[order]
+            self.keyframes = [self.keyframes[i] for i in order]
+            if self.jpeg_bytes is not None:
+                self.jpeg_bytes = [self.jpeg_bytes[i] for i in order]
 
 
 # OUTPUT LAYER: Analysis Results